@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import MetaData, create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 
-SQLITE_DATABASE_URL = "sqlite:///./webnovels.db"
+SQLITE_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./webnovels.db")
 
 engine = create_engine(
     SQLITE_DATABASE_URL, connect_args={"check_same_thread": False}
@@ -10,9 +12,33 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def add_missing_columns(metadata: MetaData) -> None:
+    """Add nullable columns introduced after a table was first created.
+
+    ``create_all`` only creates missing tables, so existing databases would
+    otherwise never pick up new model columns.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f'ALTER TABLE "{table.name}" '
+                        f'ADD COLUMN "{column.name}" {col_type}'
+                    )
+                )
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import FastAPI, Form, HTTPException, Request
@@ -5,36 +8,48 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 from markupsafe import Markup
 
-from .database import engine
+from .database import add_missing_columns, engine
 from .depends import SessionDep
 from .models import Base, Chapter, Novel
+from .rendering import (
+    chapter_html,
+    refresh_stale_chapters,
+    set_chapter_content,
+)
 from .scraper.base_scraper import BaseScraper
 from .scraper.scraper_factory import ScraperFactory
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+add_missing_columns(Base.metadata)
 
-app = FastAPI(title="WebNovel Scraper")
 
-templates = Jinja2Templates(directory="app/templates")
+async def refresh_in_background(stop: threading.Event) -> None:
+    try:
+        refreshed = await asyncio.to_thread(refresh_stale_chapters, stop)
+        if refreshed:
+            print(f"Refreshed HTML and content hash for {refreshed} chapters")
+    except Exception as e:
+        print(f"Error refreshing stale chapters: {e}")
 
 
-# -------------------- Helper: linebreaks filter --------------------
-def linebreaks(text):
-    if not text:
-        return ""
-    paragraphs = text.split("\n\n")
-    result = []
-    for para in paragraphs:
-        if para.strip():
-            para = para.replace("\n", "<br>")
-            result.append(f"<p>{para}</p>")
-    return Markup("\n".join(result))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Re-render outdated HTML and backfill hashes without blocking startup
+    stop = threading.Event()
+    refresh_task = asyncio.create_task(refresh_in_background(stop))
+    yield
+    # Let the worker thread finish its current batch, but don't wait for the rest
+    stop.set()
+    await refresh_task
 
 
-templates.env.filters["linebreaks"] = linebreaks
+app = FastAPI(title="WebNovel Scraper", lifespan=lifespan)
+
+templates = Jinja2Templates(directory="app/templates")
 
 
 # -------------------- Routes --------------------
@@ -116,6 +131,7 @@ async def novel_detail(request: Request, novel_slug: str, db: SessionDep):
 
     chapters = db.scalars(
         select(Chapter)
+        .options(load_only(Chapter.id, Chapter.chapter_number, Chapter.title))
         .where(Chapter.novel_id == novel.id)
         .order_by(Chapter.chapter_number)
     ).all()
@@ -132,10 +148,13 @@ async def scrape_chapters(
     novel_id: Annotated[int, Form()],
     start_chapter: Annotated[int, Form()] = 1,
     end_chapter: Annotated[int | None, Form()] = None,
+    refresh: Annotated[bool, Form()] = False,
 ):
     """Scrape the actual content of chapters for a given novel.
 
     The chapter metadata (titles, URLs, numbers) must already exist in the DB.
+    With ``refresh``, chapters that already have content are re-scraped too,
+    but only rewritten when their content hash differs from the stored one.
     """
     # 1️⃣ Validate novel
     novel = db.scalar(select(Novel).where(Novel.id == novel_id))
@@ -167,31 +186,54 @@ async def scrape_chapters(
     scraper = ScraperFactory.create_scraper(website)
 
     scraped_count = 0
+    changed_count = 0
+    unchanged_count = 0
+    failed_count = 0
 
     try:
         async with scraper:
             for chapter in chapters_to_scrape:
-                # Skip if chapter already has content
-                if chapter.content:
+                # Skip if chapter already has content, unless re-verifying
+                had_content = bool(chapter.content)
+                if had_content and not refresh:
                     continue
 
                 if not chapter.source_url:
                     continue  # skip invalid metadata rows
 
-                # Scrape and update content
+                # Scrape and update content only if it actually changed
                 content = await scraper.scrape_chapter(chapter.source_url)
                 if not content:
+                    failed_count += 1  # never overwrite stored content
                     continue
 
-                chapter.content = content
-                scraped_count += 1
+                if not set_chapter_content(chapter, content):
+                    unchanged_count += 1
+                elif had_content:
+                    changed_count += 1
+                else:
+                    scraped_count += 1
 
             db.commit()
 
+        if refresh:
+            checked_count = scraped_count + changed_count + unchanged_count
+            message = (
+                f"Checked {checked_count} chapters: {scraped_count} new, "
+                f"{changed_count} changed, {unchanged_count} unchanged"
+            )
+        else:
+            message = f"Successfully scraped {scraped_count} chapters"
+        if failed_count:
+            message += f", {failed_count} failed"
+
         return JSONResponse(
             {
-                "message": f"Successfully scraped {scraped_count} chapters",
+                "message": message,
                 "scraped_count": scraped_count,
+                "changed_count": changed_count,
+                "unchanged_count": unchanged_count,
+                "failed_count": failed_count,
             }
         )
 
@@ -210,18 +252,26 @@ async def read_chapter(
     if not novel:
         raise HTTPException(status_code=404, detail="Novel not found")
 
+    # Load the full row only for the chapter being shown
+    chapter = db.scalar(
+        select(Chapter)
+        .where(
+            Chapter.novel_id == novel.id,
+            Chapter.chapter_number == chapter_number,
+        )
+        .order_by(Chapter.id)
+    )
+    if not chapter:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+    # Navigation only needs numbers and titles, not chapter text
     all_chapters = db.scalars(
         select(Chapter)
+        .options(load_only(Chapter.id, Chapter.chapter_number, Chapter.title))
         .where(Chapter.novel_id == novel.id)
         .order_by(Chapter.chapter_number)
     ).all()
 
-    chapter = next(
-        (c for c in all_chapters if c.chapter_number == chapter_number), None
-    )
-    if not chapter:
-        raise HTTPException(status_code=404, detail="Chapter not found")
-
     idx = all_chapters.index(chapter)
     prev_chapter = all_chapters[idx - 1] if idx > 0 else None
     next_chapter = all_chapters[idx + 1] if idx < len(all_chapters) - 1 else None
@@ -232,6 +282,7 @@ async def read_chapter(
             "request": request,
             "novel": novel,
             "chapter": chapter,
+            "chapter_html": Markup(chapter_html(chapter)),
             "prev_chapter": prev_chapter,
             "next_chapter": next_chapter,
             "all_chapters": all_chapters,
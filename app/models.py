@@ -47,6 +47,11 @@ class Chapter(Base):
     chapter_number: Mapped[int] = mapped_column(Integer)
     source_url: Mapped[str] = mapped_column(String(1000), unique=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_html: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_html_version: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
     novel_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("novels.id", ondelete="CASCADE"), index=True
     )
@@ -0,0 +1,133 @@
+import hashlib
+import html
+import threading
+import unicodedata
+
+from sqlalchemy import bindparam, or_, select, update
+
+from .database import engine
+from .models import Chapter
+
+# Bump whenever render_chapter_html changes its output so stored HTML gets
+# regenerated by refresh_stale_chapters().
+CHAPTER_HTML_VERSION = 1
+
+RERENDER_BATCH_SIZE = 200
+
+
+def render_chapter_html(text: str | None) -> str:
+    """Convert scraped chapter text into escaped paragraph HTML."""
+    if not text:
+        return ""
+    result = []
+    for para in text.split("\n\n"):
+        if para.strip():
+            para = html.escape(para).replace("\n", "<br>")
+            result.append(f"<p>{para}</p>")
+    return "\n".join(result)
+
+
+def content_fingerprint(text: str) -> str:
+    """Return a stable SHA-256 hash of chapter text.
+
+    Text is NFC-normalized, line endings unified and surrounding whitespace
+    trimmed per line, so cosmetic differences between scrapes don't count
+    as changes.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    normalized = "\n".join(line.strip() for line in text.split("\n")).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def set_chapter_content(chapter: Chapter, content: str) -> bool:
+    """Store chapter text together with its hash and pre-rendered HTML.
+
+    Returns False without touching the row if the content is unchanged.
+    Rows without a stored hash yet are compared against their current text;
+    refresh_stale_chapters() backfills the hash itself.
+    """
+    content_hash = content_fingerprint(content)
+    if chapter.content is not None:
+        stored_hash = chapter.content_hash or content_fingerprint(chapter.content)
+        if stored_hash == content_hash:
+            return False
+
+    chapter.content = content
+    chapter.content_hash = content_hash
+    chapter.content_html = render_chapter_html(content)
+    chapter.content_html_version = CHAPTER_HTML_VERSION
+    return True
+
+
+def chapter_html(chapter: Chapter) -> str:
+    """Return stored HTML, rendering on the fly if it is missing or stale."""
+    if chapter.content_html_version == CHAPTER_HTML_VERSION:
+        return chapter.content_html or ""
+    return render_chapter_html(chapter.content)
+
+
+def refresh_stale_chapters(stop: threading.Event | None = None) -> int:
+    """Fill in derived columns for chapters that are missing or outdated.
+
+    Re-renders HTML that predates the current formatter version and backfills
+    ``content_hash`` for rows stored before hashing existed. Runs in batches
+    on its own connection so it can be scheduled in the background at
+    startup; setting ``stop`` ends it between batches. Rows are written with
+    a Core UPDATE that keeps ``updated_at`` as is, since neither is a
+    content change.
+    """
+    chapters = Chapter.__table__
+    stale = (
+        select(chapters.c.id, chapters.c.content)
+        .where(
+            chapters.c.id > bindparam("last_id"),
+            chapters.c.content.is_not(None),
+            or_(
+                chapters.c.content_hash.is_(None),
+                chapters.c.content_html_version.is_(None),
+                chapters.c.content_html_version != CHAPTER_HTML_VERSION,
+            ),
+        )
+        .order_by(chapters.c.id)
+        .limit(RERENDER_BATCH_SIZE)
+    )
+    # Matching on the content read guards against a scrape committing new
+    # text between the SELECT and the UPDATE; such rows are left alone.
+    refresh = (
+        update(chapters)
+        .where(
+            chapters.c.id == bindparam("chapter_id"),
+            chapters.c.content == bindparam("read_content"),
+        )
+        .values(
+            content_hash=bindparam("hash"),
+            content_html=bindparam("html"),
+            content_html_version=CHAPTER_HTML_VERSION,
+            updated_at=chapters.c.updated_at,
+        )
+    )
+
+    refreshed = 0
+    last_id = 0
+    while stop is None or not stop.is_set():
+        with engine.begin() as conn:
+            batch = conn.execute(stale, {"last_id": last_id}).all()
+            if not batch:
+                break
+            result = conn.execute(
+                refresh,
+                [
+                    {
+                        "chapter_id": row.id,
+                        "read_content": row.content,
+                        "hash": content_fingerprint(row.content),
+                        "html": render_chapter_html(row.content),
+                    }
+                    for row in batch
+                ],
+            )
+
+        refreshed += result.rowcount
+        last_id = batch[-1].id
+    return refreshed
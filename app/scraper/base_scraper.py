@@ -68,8 +68,8 @@ class BaseScraper(ABC):
         ...
 
     @abstractmethod
-    async def scrape_chapter(self, chapter_url: str) -> str:
-        """Scrape chapter content and return as text"""
+    async def scrape_chapter(self, chapter_url: str) -> str | None:
+        """Scrape chapter content and return as text, or None on failure"""
         ...
 
     @staticmethod
@@ -155,16 +155,15 @@ class LibReadScraper(BaseScraper):
         print(f"✅ Chapter list completed: {len(chapters)} chapters found")
         return chapters
 
-    async def scrape_chapter(self, chapter_url: str) -> str:
+    async def scrape_chapter(self, chapter_url: str) -> str | None:
         print(f"📖 Scraping chapter content from: {chapter_url}")
         
         html = await self.fetch_html(chapter_url)
         print(f"📄 Chapter HTML fetched: {'Success' if html else 'Failed'}")
         
         if not html:
-            error_msg = "Failed to fetch chapter content"
-            print(f"❌ {error_msg}")
-            return error_msg
+            print("❌ Failed to fetch chapter content")
+            return None
 
         soup = BeautifulSoup(html, "lxml")
         print("✅ Chapter HTML parsed")
@@ -173,9 +172,8 @@ class LibReadScraper(BaseScraper):
         print("🔍 Looking for chapter content container...")
         content_elem = soup.find("div", id="article")
         if not content_elem:
-            error_msg = "Chapter content not found"
-            print(f"❌ {error_msg}")
-            return error_msg
+            print("❌ Chapter content not found")
+            return None
 
         print("✅ Chapter content container found")
         print(f"📊 Initial content element type: {type(content_elem)}")
@@ -191,7 +189,7 @@ class LibReadScraper(BaseScraper):
         working_content = BeautifulSoup(str(content_elem), 'lxml').find('div', id='article')
         if not working_content:
             print("❌ Failed to create working copy")
-            return "Failed to process chapter content"
+            return None
         
         print("✅ Working copy created")
 
@@ -263,7 +261,8 @@ class LibReadScraper(BaseScraper):
         final_content = "\n\n".join(content_parts)
         print(f"📄 Chapter content assembled: {len(final_content)} characters")
         
-        if not final_content.strip():
-            print("⚠️ WARNING: Final content is empty!")
-        
+        if not non_empty_paragraphs:
+            print("❌ No chapter paragraphs found")
+            return None
+
         return final_content
\ No newline at end of file
@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway database before app.database is imported,
+# so importing app.main never touches ./webnovels.db
+os.environ["DATABASE_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+
+from app.database import engine  # noqa: E402
+from app.models import Base  # noqa: E402
+
+
+@pytest.fixture
+def db_tables():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
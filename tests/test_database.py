@@ -0,0 +1,100 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app import database
+from app.models import Base
+
+# chapters table as created before content_hash/content_html existed
+OLD_SCHEMA = [
+    """
+    CREATE TABLE novels (
+        id INTEGER NOT NULL,
+        title VARCHAR(500) NOT NULL,
+        slug VARCHAR(500) NOT NULL,
+        author VARCHAR(200) NOT NULL,
+        description TEXT NOT NULL,
+        cover_url VARCHAR(1000),
+        source_url VARCHAR(1000) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (source_url)
+    )
+    """,
+    """
+    CREATE TABLE chapters (
+        id INTEGER NOT NULL,
+        title VARCHAR(500) NOT NULL,
+        chapter_number INTEGER NOT NULL,
+        source_url VARCHAR(1000) NOT NULL,
+        content TEXT,
+        novel_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (source_url),
+        FOREIGN KEY(novel_id) REFERENCES novels (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    INSERT INTO novels (id, title, slug, author, description, source_url)
+    VALUES (1, 'Novel', 'novel', 'Author', '', 'https://example.com/novel')
+    """,
+    """
+    INSERT INTO chapters
+        (id, title, chapter_number, source_url, content, novel_id,
+         created_at, updated_at)
+    VALUES
+        (1, 'One', 1, 'https://example.com/1', 'Old text', 1,
+         '2020-01-01 00:00:00', '2020-01-02 00:00:00')
+    """,
+]
+
+
+def test_add_missing_columns_upgrades_old_chapters_table(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        for statement in OLD_SCHEMA:
+            conn.execute(text(statement))
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.add_missing_columns(Base.metadata)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("chapters")}
+    assert {"content_hash", "content_html", "content_html_version"} <= columns
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(
+                "SELECT title, chapter_number, content, created_at, updated_at, "
+                "content_hash, content_html, content_html_version "
+                "FROM chapters WHERE id = 1"
+            )
+        ).one()
+    assert tuple(row) == (
+        "One",
+        1,
+        "Old text",
+        "2020-01-01 00:00:00",
+        "2020-01-02 00:00:00",
+        None,
+        None,
+        None,
+    )
+
+
+def test_add_missing_columns_is_idempotent(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, "engine", engine)
+
+    def chapter_columns():
+        return [
+            (c["name"], str(c["type"]))
+            for c in inspect(engine).get_columns("chapters")
+        ]
+
+    before = chapter_columns()
+    database.add_missing_columns(Base.metadata)
+    database.add_missing_columns(Base.metadata)
+
+    assert chapter_columns() == before
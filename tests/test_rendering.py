@@ -0,0 +1,191 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app import rendering
+from app.models import Base, Chapter, Novel
+from app.rendering import (
+    CHAPTER_HTML_VERSION,
+    chapter_html,
+    content_fingerprint,
+    render_chapter_html,
+    set_chapter_content,
+)
+
+
+def test_render_chapter_html_wraps_paragraphs():
+    text = "First line\nsecond line\n\n   \n\nSecond paragraph"
+    assert render_chapter_html(text) == (
+        "<p>First line<br>second line</p>\n<p>Second paragraph</p>"
+    )
+
+
+def test_render_chapter_html_escapes_markup():
+    html = render_chapter_html('<script>alert("x")</script> & more')
+    assert "<script>" not in html
+    assert html == (
+        "<p>&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; more</p>"
+    )
+
+
+def test_render_chapter_html_empty():
+    assert render_chapter_html(None) == ""
+    assert render_chapter_html("") == ""
+
+
+def test_chapter_html_uses_stored_html_for_current_version():
+    chapter = Chapter(
+        content="text",
+        content_html="<p>stored</p>",
+        content_html_version=CHAPTER_HTML_VERSION,
+    )
+    assert chapter_html(chapter) == "<p>stored</p>"
+
+
+def test_chapter_html_renders_stale_or_missing_html():
+    stale = Chapter(
+        content="fresh",
+        content_html="<p>old</p>",
+        content_html_version=CHAPTER_HTML_VERSION - 1,
+    )
+    missing = Chapter(content="fresh")
+    assert chapter_html(stale) == "<p>fresh</p>"
+    assert chapter_html(missing) == "<p>fresh</p>"
+
+
+def test_content_fingerprint_ignores_cosmetic_differences():
+    text = "Caf\u00e9 opens\n\nSecond paragraph"
+    variant = "  Cafe\u0301 opens  \r\n\r\nSecond paragraph\t\n"
+    assert content_fingerprint(text) == content_fingerprint(variant)
+    assert len(content_fingerprint(text)) == 64
+
+
+def test_content_fingerprint_detects_text_changes():
+    assert content_fingerprint("one\n\ntwo") != content_fingerprint("one\n\nthree")
+
+
+def test_set_chapter_content_new_chapter():
+    chapter = Chapter()
+    assert set_chapter_content(chapter, "Hello & welcome") is True
+    assert chapter.content == "Hello & welcome"
+    assert chapter.content_hash == content_fingerprint("Hello & welcome")
+    assert chapter.content_html == "<p>Hello &amp; welcome</p>"
+    assert chapter.content_html_version == CHAPTER_HTML_VERSION
+
+
+def test_set_chapter_content_skips_unchanged():
+    chapter = Chapter()
+    set_chapter_content(chapter, "Same text")
+    assert set_chapter_content(chapter, "Same text  \r\n") is False
+    assert chapter.content == "Same text"
+
+
+def test_set_chapter_content_compares_legacy_rows_without_hash():
+    chapter = Chapter(content="Old text")
+    assert set_chapter_content(chapter, "Old text") is False
+    assert chapter.content_hash is None
+    assert set_chapter_content(chapter, "New text") is True
+    assert chapter.content == "New text"
+    assert chapter.content_hash == content_fingerprint("New text")
+
+
+def test_refresh_stale_chapters_keeps_updated_at(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(rendering, "engine", engine)
+    stamp = datetime(2020, 1, 1)
+
+    with Session(engine) as db:
+        novel = Novel(
+            title="Novel",
+            slug="novel",
+            author="Author",
+            description="",
+            source_url="https://example.com/novel",
+        )
+        db.add(novel)
+        db.flush()
+        db.add_all(
+            [
+                Chapter(
+                    title="Legacy",
+                    chapter_number=1,
+                    source_url="https://example.com/1",
+                    content="a < b",
+                    novel_id=novel.id,
+                    updated_at=stamp,
+                ),
+                Chapter(
+                    title="Empty",
+                    chapter_number=2,
+                    source_url="https://example.com/2",
+                    novel_id=novel.id,
+                    updated_at=stamp,
+                ),
+            ]
+        )
+        db.commit()
+
+    assert rendering.refresh_stale_chapters() == 1
+    assert rendering.refresh_stale_chapters() == 0
+
+    with Session(engine) as db:
+        legacy = db.scalar(select(Chapter).where(Chapter.chapter_number == 1))
+        assert legacy.content_html == "<p>a &lt; b</p>"
+        assert legacy.content_html_version == CHAPTER_HTML_VERSION
+        assert legacy.content_hash == content_fingerprint("a < b")
+        assert legacy.updated_at == stamp
+
+
+def test_refresh_stale_chapters_skips_rows_rewritten_mid_batch(
+    monkeypatch, tmp_path
+):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(rendering, "engine", engine)
+
+    with Session(engine) as db:
+        novel = Novel(
+            title="Novel",
+            slug="novel",
+            author="Author",
+            description="",
+            source_url="https://example.com/novel",
+        )
+        db.add(novel)
+        db.flush()
+        db.add(
+            Chapter(
+                title="Chapter",
+                chapter_number=1,
+                source_url="https://example.com/1",
+                content="old text",
+                novel_id=novel.id,
+            )
+        )
+        db.commit()
+
+    render = rendering.render_chapter_html
+    scraped = False
+
+    def render_during_scrape(text):
+        # Simulate a scrape committing new content after the batch was read
+        nonlocal scraped
+        if not scraped:
+            scraped = True
+            with Session(engine) as db:
+                chapter = db.scalar(select(Chapter))
+                set_chapter_content(chapter, "new text")
+                db.commit()
+        return render(text)
+
+    monkeypatch.setattr(rendering, "render_chapter_html", render_during_scrape)
+
+    assert rendering.refresh_stale_chapters() == 0
+
+    with Session(engine) as db:
+        chapter = db.scalar(select(Chapter))
+        assert chapter.content == "new text"
+        assert chapter.content_html == "<p>new text</p>"
+        assert chapter.content_hash == content_fingerprint("new text")
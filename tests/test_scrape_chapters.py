@@ -0,0 +1,167 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.main import app
+from app.models import Chapter, Novel
+from app.rendering import content_fingerprint, set_chapter_content
+from app.scraper.base_scraper import BaseScraper
+from app.scraper.scraper_factory import ScraperFactory
+
+STAMP = datetime(2020, 1, 1)
+
+
+class StubScraper(BaseScraper):
+    """Serves chapter text from a dict; missing URLs fail like a real scrape."""
+
+    def __init__(self, pages: dict[str, str | None]):
+        super().__init__()
+        self.pages = pages
+
+    async def scrape_metadata(self, url):
+        raise NotImplementedError
+
+    async def get_chapter_list(self, url):
+        raise NotImplementedError
+
+    async def scrape_chapter(self, chapter_url):
+        return self.pages.get(chapter_url)
+
+
+@pytest.fixture
+def client(db_tables):
+    # No context manager: skip the lifespan's background refresh
+    return TestClient(app)
+
+
+@pytest.fixture
+def novel_id(db_tables):
+    """A novel with three chapters: two already scraped and one empty."""
+    with SessionLocal() as db:
+        novel = Novel(
+            title="Novel",
+            slug="novel",
+            author="Author",
+            description="",
+            source_url="https://libread.com/novel",
+        )
+        db.add(novel)
+        db.flush()
+        for number, content in [(1, "Same text"), (2, "Old text"), (3, None)]:
+            chapter = Chapter(
+                title=f"Chapter {number}",
+                chapter_number=number,
+                source_url=f"https://libread.com/novel/{number}",
+                novel_id=novel.id,
+            )
+            if content:
+                set_chapter_content(chapter, content)
+            db.add(chapter)
+        db.commit()
+        db.execute(update(Chapter).values(updated_at=STAMP))
+        db.commit()
+        return novel.id
+
+
+def use_scraper(monkeypatch, pages):
+    monkeypatch.setattr(
+        ScraperFactory,
+        "create_scraper",
+        staticmethod(lambda website: StubScraper(pages)),
+    )
+
+
+def load_chapters():
+    with SessionLocal() as db:
+        return {
+            c.chapter_number: c
+            for c in db.scalars(select(Chapter).order_by(Chapter.chapter_number))
+        }
+
+
+def test_scrape_fills_only_empty_chapters(client, novel_id, monkeypatch):
+    use_scraper(
+        monkeypatch,
+        {
+            "https://libread.com/novel/1": "Different text",
+            "https://libread.com/novel/2": "Different text",
+            "https://libread.com/novel/3": "New text",
+        },
+    )
+
+    response = client.post("/scrape-chapters", data={"novel_id": novel_id})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Successfully scraped 1 chapters",
+        "scraped_count": 1,
+        "changed_count": 0,
+        "unchanged_count": 0,
+        "failed_count": 0,
+    }
+    chapters = load_chapters()
+    assert chapters[1].content == "Same text"
+    assert chapters[2].content == "Old text"
+    assert chapters[3].content == "New text"
+    assert chapters[3].content_html == "<p>New text</p>"
+
+
+def test_refresh_rewrites_only_changed_chapters(client, novel_id, monkeypatch):
+    use_scraper(
+        monkeypatch,
+        {
+            "https://libread.com/novel/1": "Same text\r\n",
+            "https://libread.com/novel/2": "Updated text",
+            "https://libread.com/novel/3": "New text",
+        },
+    )
+
+    response = client.post(
+        "/scrape-chapters", data={"novel_id": novel_id, "refresh": "true"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Checked 3 chapters: 1 new, 1 changed, 1 unchanged",
+        "scraped_count": 1,
+        "changed_count": 1,
+        "unchanged_count": 1,
+        "failed_count": 0,
+    }
+    chapters = load_chapters()
+
+    assert chapters[1].content == "Same text"
+    assert chapters[1].updated_at == STAMP
+
+    assert chapters[2].content == "Updated text"
+    assert chapters[2].content_hash == content_fingerprint("Updated text")
+    assert chapters[2].content_html == "<p>Updated text</p>"
+    assert chapters[2].updated_at != STAMP
+
+    assert chapters[3].content == "New text"
+
+
+def test_refresh_never_overwrites_with_failed_scrape(client, novel_id, monkeypatch):
+    use_scraper(monkeypatch, {"https://libread.com/novel/1": "Same text"})
+
+    response = client.post(
+        "/scrape-chapters", data={"novel_id": novel_id, "refresh": "true"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Checked 1 chapters: 0 new, 0 changed, 1 unchanged, 2 failed",
+        "scraped_count": 0,
+        "changed_count": 0,
+        "unchanged_count": 1,
+        "failed_count": 2,
+    }
+    chapters = load_chapters()
+    assert chapters[2].content == "Old text"
+    assert chapters[2].content_hash == content_fingerprint("Old text")
+    assert chapters[2].content_html == "<p>Old text</p>"
+    assert chapters[2].updated_at == STAMP
+    assert chapters[3].content is None